@@ -0,0 +1,91 @@
+"""
+Numba-compiled geometry kernel for the L-systems experiment.
+The sentence is passed as a uint8 code array and walked once in native
+code, writing every polyline vertex into a single preallocated array.
+"""
+
+import numpy as np
+from numba import njit
+
+
+# Byte codes of the alphabet
+CODE_F, CODE_PLUS, CODE_MINUS, CODE_PUSH, CODE_POP = b"F+-[]"
+
+
+@njit(cache=True, fastmath=True)
+def build_geometry(codes, cos_table, sin_table, length, start_x, start_y, turn):
+    """
+    Walks the sentence codes and returns (points, bounds, n_lines):
+        points:  (M, 2) float32 array holding all polyline vertices
+        bounds:  polyline i spans points[bounds[i]:bounds[i+1]]
+        n_lines: number of finished polylines
+    """
+    n_f = n_push = n_pop = 0
+    for i in range(codes.size):
+        code = codes[i]
+        if code == CODE_F:
+            n_f += 1
+        elif code == CODE_PUSH:
+            n_push += 1
+        elif code == CODE_POP:
+            n_pop += 1
+
+    points = np.empty((n_f + n_pop + 1, 2), dtype=np.float32)
+    bounds = np.empty(n_pop + 2, dtype=np.int64)
+    stack_x    = np.empty(n_push + 1, dtype=np.float64)
+    stack_y    = np.empty(n_push + 1, dtype=np.float64)
+    stack_turn = np.empty(n_push + 1, dtype=np.int64)
+
+    # Accumulate positions in float64, store compact float32 vertices.
+    # The current polyline always spans points[line_start:n].
+    cur_x = start_x
+    cur_y = start_y
+    points[0, 0] = cur_x
+    points[0, 1] = cur_y
+    bounds[0] = 0
+    n = 1
+    line_start = 0
+    n_lines = 0
+    stack_top = 0
+    prev_f = False
+    for i in range(codes.size):
+        code = codes[i]
+        if code == CODE_F:
+            cur_x -= length * cos_table[turn]
+            cur_y -= length * sin_table[turn]
+            if prev_f:
+                # merge consecutive F into a single straight segment
+                points[n - 1, 0] = cur_x
+                points[n - 1, 1] = cur_y
+            else:
+                points[n, 0] = cur_x
+                points[n, 1] = cur_y
+                n += 1
+            prev_f = True
+            continue
+        prev_f = False
+        if code == CODE_PLUS:
+            turn += 1
+        elif code == CODE_MINUS:
+            turn -= 1
+        elif code == CODE_PUSH:
+            stack_x[stack_top] = cur_x
+            stack_y[stack_top] = cur_y
+            stack_turn[stack_top] = turn
+            stack_top += 1
+        elif code == CODE_POP:
+            if n - line_start > 1:
+                bounds[n_lines + 1] = n
+                n_lines += 1
+                line_start = n
+            else:
+                n = line_start  # discard a line with no segments
+            stack_top -= 1
+            cur_x = stack_x[stack_top]
+            cur_y = stack_y[stack_top]
+            turn  = stack_turn[stack_top]
+            points[n, 0] = cur_x
+            points[n, 1] = cur_y
+            n += 1
+
+    return points, bounds, n_lines
@@ -0,0 +1,125 @@
+"""
+Numba-compiled intersection kernel for the shadow casting experiment.
+Computes the closest ray-section hits without allocating the (R, N)
+temporaries of the NumPy version: each (ray, section) pair stays in
+registers, and the BVH traversal prunes whole groups of sections the
+ray cannot reach.
+"""
+
+import os
+
+import numpy as np
+from numba import njit, prange, set_num_threads
+
+# Leave cores free for pygame's event and audio threads
+set_num_threads(min(os.cpu_count() or 1, 4))
+
+
+@njit(cache=True, fastmath=True, boundscheck=False, inline="always")
+def _box_t_near(ox, oy, rdx, rdy, xmin, ymin, xmax, ymax):
+    """Slab test: the ray parameter where the (forward) ray enters the
+    box, or inf if it misses."""
+    #pylint:disable=invalid-name # (single letter o, d, t)
+    t_near = 0.0
+    t_far  = np.inf
+    if rdx == 0:
+        if not xmin <= ox <= xmax:
+            return np.inf
+    else:
+        t_1 = (xmin - ox) / rdx
+        t_2 = (xmax - ox) / rdx
+        if t_1 > t_2:
+            t_1, t_2 = t_2, t_1
+        t_near = max(t_near, t_1)
+        t_far  = min(t_far, t_2)
+    if rdy == 0:
+        if not ymin <= oy <= ymax:
+            return np.inf
+    else:
+        t_1 = (ymin - oy) / rdy
+        t_2 = (ymax - oy) / rdy
+        if t_1 > t_2:
+            t_1, t_2 = t_2, t_1
+        t_near = max(t_near, t_1)
+        t_far  = min(t_far, t_2)
+    if t_near > t_far:
+        return np.inf
+    return t_near
+
+
+@njit(cache=True, parallel=True, fastmath=True, boundscheck=False)
+def closest_hits(origin_x, origin_y, directions,
+                 p1x, p1y, dx, dy,
+                 node_xmin, node_ymin, node_xmax, node_ymax,
+                 left, right, first, count, order,
+                 hits, hit_idx):
+    """
+    Writes the (R, 2) closest intersection per ray into hits and the
+    index of the section it landed on into hit_idx (-1 if the ray hit
+    nothing). The rays come in as (R, 2) direction vectors relative to
+    the origin (the grazing nudge is not representable in absolute
+    screen-sized float32 coordinates); the sections are Map's SoA
+    columns (first endpoints and p1 - p2 differences) together with the
+    BVH node columns. hits and hit_idx are caller-allocated so frames
+    can reuse them. Each ray walks the BVH with an explicit stack,
+    skipping any node the ray misses or only enters beyond the best
+    hit so far.
+    """
+    #pylint:disable=invalid-name # (single letter x, y, t, u)
+    n_rays = directions.shape[0]
+    # Rays are independent, so split them across threads
+    for r in prange(n_rays):  #pylint:disable=not-an-iterable
+        hit_idx[r] = -1
+        # The columns stay float32 for bandwidth, but the per-ray
+        # scalar math runs in float64: with a float32 denominator the
+        # grazing rays aimed at the screen corners round u onto the
+        # strict (0, 1) bound and hit nothing
+        v_x = np.float64(directions[r, 0])
+        v_y = np.float64(directions[r, 1])
+        rx = -v_x
+        ry = -v_y
+        best_t = np.inf
+        stack = np.empty(64, dtype=np.int32)
+        stack[0] = 0
+        top = 1
+        while top > 0:
+            top -= 1
+            node = stack[top]
+            t_near = _box_t_near(origin_x, origin_y, v_x, v_y,
+                                 node_xmin[node], node_ymin[node],
+                                 node_xmax[node], node_ymax[node])
+            if t_near >= best_t:
+                continue
+            if left[node] < 0:
+                for i in range(first[node], first[node] + count[node]):
+                    s = order[i]
+                    dx_34 = dx[s]
+                    dy_34 = dy[s]
+                    x_13 = origin_x - p1x[s]
+                    y_13 = origin_y - p1y[s]
+                    # Half-plane pre-cull: if both endpoints sit strictly
+                    # on the same side of the ray line there can be no
+                    # crossing, and the divides below are never reached
+                    c_1 = y_13*rx - x_13*ry
+                    c_2 = c_1 + dy_34*rx - dx_34*ry
+                    if c_1 * c_2 > 0:
+                        continue
+                    denominator = rx*dy_34 - ry*dx_34
+                    if denominator == 0:
+                        continue  # parallel lines never intersect
+                    t = (x_13*dy_34 - y_13*dx_34) / denominator
+                    u = (x_13*ry - y_13*rx) / denominator
+                    # t must be strictly positive: with the light right
+                    # on a shape vertex, rounding lets the incident
+                    # sections pass the u test at t = 0 and the fan
+                    # collapses onto the origin
+                    if 0 < u < 1 and 0 < t < best_t:
+                        best_t = t
+                        hit_idx[r] = s
+            else:
+                stack[top] = left[node]
+                stack[top + 1] = right[node]
+                top += 2
+        if hit_idx[r] >= 0:
+            hits[r, 0] = origin_x + best_t * v_x
+            hits[r, 1] = origin_y + best_t * v_y
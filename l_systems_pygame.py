@@ -3,13 +3,48 @@ Implementation of L-systems to draw realistic looking plants
 (see: https://en.wikipedia.org/wiki/L-system)
 """
 
+import collections
+import functools
+import math
+
 import pygame as pg
 import numpy as np
 
+try:
+    from _lsys_core import build_geometry
+except ImportError:  # numba is optional; fall back to the NumPy path
+    build_geometry = None
+
 
 SCREEN_WIDTH  = 1080
 SCREEN_HEIGHT = 720
-ROTATE_90 = np.deg2rad(90) # Compute it only one time
+
+# Parse the color names only once, at import
+BG_COLOR     = pg.Color("cadetblue1")
+TEXT_COLOR   = pg.Color("black")
+STEM_COLOR   = pg.Color("burlywood4")
+LEAVES_COLOR = pg.Color("springgreen4")
+ROTATE_90 = math.radians(90) # Compute it only one time
+MAX_TURNS = 720 # Bound on the net number of +/- turns along any branch
+
+# Byte codes of the alphabet, for the vectorized sentence traversal
+CODE_F, CODE_PLUS, CODE_MINUS, CODE_PUSH, CODE_POP = b"F+-[]"
+
+
+@functools.lru_cache(maxsize=32)
+def _rules_table(rules_key: tuple):
+    # All rules map a single character, so the whole rewrite can run
+    # in C through str.translate instead of a per-character dict lookup
+    return str.maketrans(dict(rules_key))
+
+
+@functools.lru_cache(maxsize=32)
+def _expand(axiom: str, rules_key: tuple, iteration: int):
+    # The rules are deterministic, so the sentence at any iteration is a
+    # pure function of (axiom, rules, iteration) and can be memoized
+    if iteration == 0:
+        return axiom
+    return _expand(axiom, rules_key, iteration - 1).translate(_rules_table(rules_key))
 
 
 class App():
@@ -21,6 +56,13 @@ class App():
         self.clock  = pg.time.Clock()
         self.timer  = pg.USEREVENT
         pg.time.set_timer(self.timer, 100)
+        self._text_cache = {}
+        self.hud_surface = pg.Surface((240, 120), pg.SRCALPHA)
+        self._hud_texts  = None
+        # The plants are static between grow events, so render them once
+        # into an off-screen surface and just blit it on every tick
+        self.scene_cache = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.scene_dirty = True
 
         self.main()
 
@@ -41,8 +83,11 @@ class App():
                 if event.type == pg.MOUSEBUTTONDOWN:
                     self.grow_plants(plants)
                 if event.type == self.timer:
-                    self.screen.fill(pg.Color("cadetblue1"))
-                    self.draw_plants(plants)
+                    if self.scene_dirty:
+                        self.scene_cache.fill(BG_COLOR)
+                        self.draw_plants(plants)
+                        self.scene_dirty = False
+                    self.screen.blit(self.scene_cache, (0, 0))
                     self.print_info(iteration, plants)
 
             pg.display.flip()
@@ -59,19 +104,18 @@ class App():
             "F": "FF"
         }
         position = (self.screen.get_width() / 3, self.screen.get_height())
-        stem_color = pg.Color("burlywood4")
-        leaves_color = pg.Color("springgreen4")
-        plants = [Plant(axiom, rules, position, 25, 2, 3, stem_color, 4, leaves_color),]
+        plants = [Plant(axiom, rules, position, 25, 2, 3, STEM_COLOR, 4, LEAVES_COLOR),]
         # Define more plants here and append to plants
         return plants
 
     def grow_plants(self, plants):
         for plant in plants:
             plant.grow()
+        self.scene_dirty = True
 
     def draw_plants(self, plants):
         for plant in plants:
-            plant.draw(self.screen)
+            plant.draw(self.scene_cache)
 
     def get_numbers(self, plants):
         sentences = lines = leaves = 0
@@ -92,9 +136,23 @@ class App():
         texts.append(f"Num. lines: {number_lines:,}")
         texts.append(f"Num. leaves: {number_leaves:,}")
         texts.append(f"Len. sentences: {sentence_length:,}")
-        for i, text in enumerate(texts):
-            rendered_text = self.font.render(text, True, pg.Color("black"))
-            self.screen.blit(rendered_text, (10, 10 + 20 * i))
+        # Recompose the HUD panel only when some line changed,
+        # then blit the whole panel in one call
+        if texts != self._hud_texts:
+            self._hud_texts = texts
+            self.hud_surface.fill((0, 0, 0, 0))
+            for i, text in enumerate(texts):
+                self.hud_surface.blit(self.render_text(text), (0, 20 * i))
+        self.screen.blit(self.hud_surface, (10, 10))
+
+    def render_text(self, text):
+        # Font rendering is slow and most HUD lines rarely change,
+        # so cache the rendered surfaces keyed on the string
+        if text not in self._text_cache:
+            if len(self._text_cache) > 64:
+                self._text_cache.clear()
+            self._text_cache[text] = self.font.render(text, True, TEXT_COLOR)
+        return self._text_cache[text]
 
 
 class Plant():
@@ -106,56 +164,119 @@ class Plant():
     ):
         self.sentence = axiom
         self.rules    = rules
+        self._axiom     = axiom
+        self._rules_key = tuple(sorted(rules.items()))
+        self._iteration = 0
         self.position = position
-        self.angle    = np.deg2rad(angle_deg)
+        self.angle    = math.radians(angle_deg)
+        # The heading is always angle * k for an integer k (each +/- turns
+        # by one step), so precompute every sin/cos the turtle can need,
+        # with the 90 degrees offset baked in so it grows vertically
+        turns = np.arange(-MAX_TURNS, MAX_TURNS + 1) * self.angle + ROTATE_90
+        self._cos = np.cos(turns)
+        self._sin = np.sin(turns)
         self.length   = length
         self.stem_width   = stem_width
         self.stem_color   = stem_color
         self.leaves_size  = leaves_size
         self.leaves_color = leaves_color
-        self.lines = None
+        self.lines  = None
+        self.bboxes = None
+        self._lines_cache = collections.OrderedDict()
+        self._rng = np.random.default_rng()
 
     def grow(self):
-        new_sentence = ""
-        for letter in self.sentence:
-            new_sentence += self.rules[letter] if letter in self.rules else letter
-        self.sentence = str(new_sentence)
+        self._iteration += 1
+        self.sentence = _expand(self._axiom, self._rules_key, self._iteration)
         self.update_lines()
 
     def update_lines(self):
-        angle = self.angle
-        line  = [self.position,]
-        self.lines = []
+        # Reuse the geometry of an already-visited iteration
+        if self._iteration in self._lines_cache:
+            self.lines, self.bboxes = self._lines_cache[self._iteration]
+            return
+        codes = np.frombuffer(self.sentence.encode("ascii"), dtype=np.uint8)
+        if build_geometry is not None:
+            # Compiled kernel: one native pass over the whole sentence
+            points, bounds, n_lines = build_geometry(
+                codes, self._cos, self._sin, float(self.length),
+                float(self.position[0]), float(self.position[1]), MAX_TURNS + 1)
+            self.lines = [points[bounds[i]:bounds[i + 1]] for i in range(n_lines)]
+        else:
+            self.lines = self._trace_lines(codes)
+        # Bounding box per polyline, so draw can cull off-screen ones
+        self.bboxes = [(line[:, 0].min(), line[:, 1].min(),
+                        line[:, 0].max(), line[:, 1].max()) for line in self.lines]
+        self._lines_cache[self._iteration] = (self.lines, self.bboxes)
+        if len(self._lines_cache) > 8:
+            self._lines_cache.popitem(last=False)
+
+    def _trace_lines(self, codes):
+        # Only the brackets need the Python-level stack; everything between
+        # them is handled with NumPy cumulative sums over the whole segment
+        events = np.nonzero((codes == CODE_PUSH) | (codes == CODE_POP))[0]
+        lines = []
         nodes = []
-        for i, letter in enumerate(self.sentence):
-            match letter:
-                case "F":
-                    # rotate 90 degrees so it grows vertically
-                    theta = angle + ROTATE_90
-                    line_end = (line[-1][0] - self.length * np.cos(theta),
-                                line[-1][1] - self.length * np.sin(theta))
-                    if i > 0 and self.sentence[i-1] == "F":
-                        line[-1] = line_end
-                    else:
-                        line.append(line_end)
-                case "+":
-                    angle += self.angle
-                case "-":
-                    angle -= self.angle
-                case "[":
-                    nodes.append((line[-1], angle))
-                case "]":
-                    if len(line) > 1:
-                        self.lines.append(line)
-                    line, angle = nodes.pop(-1)
-                    line = [line,]
+        start   = self.position
+        current = self.position
+        # offset index into the sin/cos tables; the + 1 is the one turn
+        # step the heading starts with
+        turn  = MAX_TURNS + 1
+        parts = []         # vertex blocks of the polyline being built
+        segment_start = 0
+        for event in [*events, codes.size]:
+            segment = codes[segment_start:event]
+            segment_start = event + 1
+            if segment.size > 0:
+                turns = turn + np.cumsum((segment == CODE_PLUS).astype(np.intp)
+                                         - (segment == CODE_MINUS))
+                turn  = turns[-1]
+                f_mask = segment == CODE_F
+                if f_mask.any():
+                    f_turns = turns[f_mask]
+                    xs = current[0] + np.cumsum(-self.length * self._cos[f_turns])
+                    ys = current[1] + np.cumsum(-self.length * self._sin[f_turns])
+                    # Keep only the last F of each straight run, merging
+                    # consecutive F segments like the old scalar loop did
+                    next_is_f = np.zeros(segment.size, dtype=bool)
+                    next_is_f[:-1] = f_mask[1:]
+                    run_ends = ~next_is_f[f_mask]
+                    parts.append(np.column_stack((xs[run_ends], ys[run_ends])))
+                    current = (xs[-1], ys[-1])
+            if event == codes.size:
+                break
+            if codes[event] == CODE_PUSH:
+                nodes.append((current, turn))
+            else:
+                if sum(len(part) for part in parts) > 0:
+                    # Accumulate in float64 for precision, store compact
+                    # float32 rows
+                    lines.append(
+                        np.concatenate([np.asarray([start]), *parts]).astype(np.float32))
+                current, turn = nodes.pop(-1)
+                start = current
+                parts = []
+        return lines
 
     def draw(self, surface):
-        if self.lines is not None:
-            for line in self.lines:
-                pg.draw.lines(surface, self.stem_color, False, line, self.stem_width)
-            for line in self.lines[::2]:  # comment to draw all leaves, overlapped with the stems
-                leave_pos = line[-1] + np.random.normal(0, 0.5, 2)
+        if self.lines is None:
+            return
+        width, height = surface.get_size()
+        for line, bbox in zip(self.lines, self.bboxes):
+            # Cull polylines entirely outside the screen
+            if bbox[2] < 0 or bbox[0] > width or bbox[3] < 0 or bbox[1] > height:
+                continue
+            # pygame rejects float32 points, so upcast at the boundary
+            pg.draw.lines(surface, self.stem_color, False,
+                          line.astype(np.float64), self.stem_width)
+        leaves = self.lines[::2]  # comment to draw all leaves, overlapped with the stems
+        if leaves:
+            positions = np.stack([line[-1] for line in leaves])
+            positions = positions + self._rng.normal(0, 0.5, positions.shape)
+            margin  = self.leaves_size
+            visible = ((positions[:, 0] > -margin) & (positions[:, 0] < width  + margin)
+                       & (positions[:, 1] > -margin) & (positions[:, 1] < height + margin))
+            for leave_pos in positions[visible]:
                 pg.draw.circle(surface, self.leaves_color, leave_pos, self.leaves_size)
 
 
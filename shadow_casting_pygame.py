@@ -2,15 +2,30 @@
 Implementation of 2D shadow casting based on line-line intersections.
 """
 
+import math
+
 import pygame as pg
+import pygame.gfxdraw
 import numpy as np
 
+try:
+    from _shadow_core import closest_hits
+except ImportError:  # numba is optional; fall back to the NumPy path
+    closest_hits = None
+
 
 SCREEN_WIDTH  = 800
 SCREEN_HEIGHT = 600
 TARGET_FPS    = 60
 TIMER_MS      = 100
 
+# Parse the color names only once, at import
+WHITE  = pg.Color("white")
+BLACK  = pg.Color("black")
+RED    = pg.Color("red")
+ORANGE = pg.Color("orange")
+GOLD   = pg.Color("gold")
+
 SCREEN_TL = (0, 0)
 SCREEN_TR = (SCREEN_WIDTH, 0)
 SCREEN_BL = (0, SCREEN_HEIGHT)
@@ -43,95 +58,58 @@ SHAPES = (
     ((700, 350), (700, 450), (650, 450), (650, 300), (700, 300), (700, 100)),
 )
 
-def compute_line_line_intersection(line1, line2):
+def get_closest_intersection(origin, direction, x_3, y_3, dx_34, dy_34):
     """
-    Computes the intersection of two infinite lines defined by two points.
+    Computes the closest intersection between a ray (defined by its
+    origin and a direction vector) and the line sections given by Map's
+    SoA columns (first endpoints and endpoint differences, one
+    contiguous array per field), all at once with NumPy instead of
+    testing section by section in Python.
     Returns:
-        x, y: point of intersection
-        t: can be used to check if point is inside section line1 (0 < t < 1)
-        u: can be used to check if point is inside section line2 (0 < u < 1)
-    Raises:
-        ZeroDivisionError: lines are parallel
+        (x, y): closest point of intersection, or None if there is none
     """
     #pylint:disable=invalid-name # (single letter x, y, t, u)
-    x_1, y_1 = line1[0]
-    x_2, y_2 = line1[1]
-    x_3, y_3 = line2[0]
-    x_4, y_4 = line2[1]
-
-    denominator = (x_1 - x_2)*(y_3 - y_4) - (y_1 - y_2)*(x_3 - x_4)
-    if denominator == 0:
-        raise ZeroDivisionError("Lines are parallel, no intersection")
-
-    t = ((x_1 - x_3) * (y_3 - y_4) - (y_1 - y_3) * (x_3 - x_4)) / denominator
-    u = ((x_1 - x_3) * (y_1 - y_2) - (y_1 - y_3) * (x_1 - x_2)) / denominator
-    x = x_1 + t * (x_2 - x_1)
-    y = y_1 + t * (y_2 - y_1)
-
-    return x, y, t, u
-
-
-class Ray():
-    def __init__(self, origin, angle, degrees = False):
-        self.color = pg.Color("red")
-        self.theta = np.deg2rad(angle) if degrees else angle
-        self.origin = None
-        self.direction = None
-        self.update_position(origin)
-
-    def update_position(self, origin):
-        self.origin = origin
-        self.direction = (self.origin[0] - np.cos(self.theta),
-                          self.origin[1] - np.sin(self.theta))
-
-    def compute_ray_section_intersection(self, line):
-        """
-        Compute intersection between ray (self) and passed line section.
-        Returns:
-            x, y: point of intersection
-            t: can be used to compare the distance of two points from the ray origin
-        Raises:
-            ZeroDivisionError: lines are parallel
-        """
-        #pylint:disable=invalid-name # (single letter x, y, t, u)
-        try:
-            x, y, t, u = compute_line_line_intersection((self.origin, self.direction), line)
-
-            if not 0 < u < 1:
-                raise ValueError("Intersection outside section")
-            if t < 0:
-                raise ValueError("Intersection in opposite direction of ray")
-
-            return x, y, t
-
-        except ZeroDivisionError as exception:
-            raise exception
-
-    def get_closest_intersection(self, lines):
-        #pylint:disable=invalid-name # (single letter x, y)
-        closest = np.Infinity
-        intersection = None
-        for line in lines:
-            try:
-                x, y, distance = self.compute_ray_section_intersection(line)
-                if distance < closest:
-                    closest = distance
-                    intersection = (x, y)
-            except ValueError:
-                # Intersection outside ray / section
-                pass
-            except ZeroDivisionError:
-                # No intersection
-                pass
-        return intersection
+    # The columns stay float32, but t and u must be computed in
+    # float64: a grazing hit right on a section endpoint rounds u to
+    # exactly 1 in float32 and the strict bound loses every candidate
+    x_1 = np.float64(origin[0])
+    y_1 = np.float64(origin[1])
+    v_x = np.float64(direction[0])
+    v_y = np.float64(direction[1])
+
+    denominator = v_y*dx_34 - v_x*dy_34
+    valid = denominator != 0  # parallel lines never intersect
+    denominator = np.where(valid, denominator, 1.0)
+
+    t = ((x_1 - x_3) * dy_34 - (y_1 - y_3) * dx_34) / denominator
+    u = ((y_1 - y_3) * v_x - (x_1 - x_3) * v_y) / denominator
+    # keep intersections inside the section and not behind the ray
+    valid &= (0 < u) & (u < 1) & (t >= 0)
+    if not valid.any():
+        return None
+
+    t = np.where(valid, t, np.inf)
+    closest = t.argmin()
+    return (x_1 + t[closest] * v_x,
+            y_1 + t[closest] * v_y)
 
 
 class ShadowCaster():
     def __init__(self, position, size, color, alpha = 128):
         self.position = position
-        self.rays = []
-        self.triangles = []
+        self.directions = np.empty((0, 2))  # one row per ray
+        self.fan_polygon = []
+        # Scratch buffers for cast_rays and the intersection kernel,
+        # sized on the first frame and reused while the target count
+        # holds, so the per-frame path allocates nothing
+        self._dx = self._dy = self._raw = self._keys = None
+        self._hits = self._hit_idx = None
         self.image = self._get_image(size, color, alpha)
+        # Full-screen compositing surfaces, allocated once and reset to
+        # opaque black (what a fresh surface holds) per frame instead
+        # of reallocating ~2 MB each per draw
+        self._radial = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert_alpha()
+        self._mask   = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert_alpha()
 
     def _get_image(self, size, color, alpha):
         img = pg.image.load("img/shadow_casting_radial.png").convert_alpha()
@@ -142,10 +120,37 @@ class ShadowCaster():
         surf.blit(img, (0, 0), None, pg.BLEND_RGBA_MULT)
         return surf
 
-    def _get_rays_intersections(self, lines):
+    def _get_rays_intersections(self, game_map):
+        """
+        Computes the closest intersection of every ray at once: with the
+        compiled kernel over all sections when numba is available, or
+        ray by ray against just the BVH candidate sections otherwise.
+        """
+        #pylint:disable=invalid-name # (single letter x, y)
+        x_1, y_1 = self.position
+        if closest_hits is not None:
+            # Compiled kernel: one native pass walking the BVH per ray,
+            # writing into the reused per-caster buffers
+            bvh = game_map.bvh
+            closest_hits(float(x_1), float(y_1), self.directions,
+                         game_map.p1x, game_map.p1y,
+                         game_map.dx, game_map.dy,
+                         bvh.node_xmin, bvh.node_ymin,
+                         bvh.node_xmax, bvh.node_ymax,
+                         bvh.left, bvh.right, bvh.first, bvh.count, bvh.order,
+                         self._hits, self._hit_idx)
+            if (self._hit_idx < 0).any():
+                raise TypeError("Ray should at least intercept the edges of the screen")
+            return self._hits
+
         intersections = []
-        for ray in self.rays:
-            intersection = ray.get_closest_intersection(lines)
+        for direction in self.directions:
+            candidates = game_map.bvh.query_ray(self.position, direction)
+            intersection = get_closest_intersection(self.position, direction,
+                                                    game_map.p1x[candidates],
+                                                    game_map.p1y[candidates],
+                                                    game_map.dx[candidates],
+                                                    game_map.dy[candidates])
             if intersection is None:
                 raise TypeError("Ray should at least intercept the edges of the screen")
             intersections.append(intersection)
@@ -155,46 +160,205 @@ class ShadowCaster():
         self.position = position
 
     def cast_rays(self, points):
+        """Casts two rays grazing each side of every (P, 2) target
+        point, as raw direction vectors: no per-ray trig, arctan2 only
+        survives as the angular sort key."""
         #pylint:disable=invalid-name # (single letter x, y)
-        error = 1e-10
-        points = set(points)
+        error = 1e-6  # below a pixel, but above float32 angle resolution
         x, y = self.position
-        angles = []
-        for point in points:
-            angle = np.arctan2(y - point[1], x - point[0])
-            angles += [angle - error, angle + error]
-        angles.sort()
-        self.rays = [Ray(self.position, angle) for angle in angles]
-
-    def update_triangles(self, lines, targets):
-        self.cast_rays(targets)
-        vertices = self._get_rays_intersections(lines)
-        assert len(self.rays) == len(vertices)
-
-        self.triangles = []
-        vertices.append(vertices[0])
-        for vert1, vert2 in zip(vertices, vertices[1:]):
-            self.triangles.append((self.position, vert1, vert2))
+        if self._raw is None or len(self._raw) != 2 * len(points):
+            self._dx      = np.empty(len(points), dtype=np.float32)
+            self._dy      = np.empty(len(points), dtype=np.float32)
+            self._raw     = np.empty((2 * len(points), 2), dtype=np.float32)
+            self._keys    = np.empty(2 * len(points), dtype=np.float32)
+            self._hits    = np.empty((2 * len(points), 2), dtype=np.float32)
+            self._hit_idx = np.empty(2 * len(points), dtype=np.int64)
+            self.directions = np.empty((2 * len(points), 2), dtype=np.float32)
+        # Every step below writes into the reused buffers so the
+        # per-frame update is in place
+        np.subtract(points[:, 0], x, out=self._dx)
+        np.subtract(points[:, 1], y, out=self._dy)
+        # A target right on the origin leaves a null vector, which
+        # would make rays that hit nothing; give it the unit direction
+        # arctan2(0, 0) used to produce
+        on_origin = (self._dx == 0) & (self._dy == 0)
+        self._dx[on_origin] = -1.0
+        # Grazing rays come from rotating the vector to each corner by
+        # -/+ error (small-angle rotation, so still no trig)
+        raw = self._raw
+        raw[0::2, 0] = self._dx + error * self._dy
+        raw[0::2, 1] = self._dy - error * self._dx
+        raw[1::2, 0] = self._dx - error * self._dy
+        raw[1::2, 1] = self._dy + error * self._dx
+        keys = np.arctan2(raw[:, 1], raw[:, 0], out=self._keys)
+        # Keep rays as one (R, 2) array of direction vectors instead of
+        # allocating R objects per frame. They stay relative to the
+        # origin: adding the position back would round the grazing
+        # nudge away at screen-sized float32 coordinates
+        np.take(raw, np.argsort(keys), axis=0, out=self.directions)
+
+    def update_triangles(self, game_map):
+        self.cast_rays(game_map.target_points)
+        vertices = self._get_rays_intersections(game_map)
+        assert len(self.directions) == len(vertices)
+
+        if closest_hits is not None:
+            # A run of consecutive rays landing on the same section
+            # traces a straight line along it, so the middle vertices
+            # are collinear: keeping only the run ends draws the same
+            # region with a much smaller polygon
+            idx = self._hit_idx
+            keep = (idx != np.roll(idx, 1)) | (idx != np.roll(idx, -1))
+            vertices = vertices[keep]
+        # The vertices are sorted by angle around the light, so they
+        # trace the whole visibility region as one star-shaped polygon
+        self.fan_polygon = vertices
 
     def draw(self, surface):
-        radial_light = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert_alpha()
+        radial_light = self._radial
+        radial_light.fill((0, 0, 0, 255))
 
-        light_center = self.position - np.divide(self.image.get_size(), 2)
+        # Plain tuple arithmetic: NumPy dispatch is overkill for two scalars
+        light_center = (self.position[0] - self.image.get_width() / 2,
+                        self.position[1] - self.image.get_height() / 2)
         radial_light.blit(self.image, light_center)
 
-        mask = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert_alpha()
-        for triangle in self.triangles:
-            pg.draw.polygon(mask, pg.Color("white"), triangle)
-        radial_light.blit(mask, (0,0), None, pg.BLEND_RGBA_MULT)
+        mask = self._mask
+        mask.fill((0, 0, 0, 255))
+        # gfxdraw fills the fan in one scanline pass, and unlike
+        # pg.draw it takes the float32 vertices as they are. Until the
+        # first update there is no fan yet and nothing is lit
+        if len(self.fan_polygon) >= 3:
+            pg.gfxdraw.filled_polygon(mask, self.fan_polygon, WHITE)
+        # Merge the mask through surfarray: one in-place NumPy multiply
+        # over the pixels instead of a third full-screen blit pass
+        rgb = pg.surfarray.pixels3d(radial_light)
+        lit = pg.surfarray.pixels_red(mask)
+        np.multiply(rgb, (lit > 0)[:, :, None], out=rgb)
+        del rgb, lit  # unlock the surfaces before blitting
 
         surface.blit(radial_light, (0, 0), None, pg.BLEND_RGBA_ADD)
 
 
+class BVH2D():
+    """
+    Bounding volume hierarchy over the map sections, built once with a
+    median split on the longest axis. query_ray returns the indices of
+    the sections whose boxes the ray can reach, so only those need the
+    full intersection test.
+    """
+    def __init__(self, segments, leaf_size = 4):
+        mins = segments.min(axis=1)
+        maxs = segments.max(axis=1)
+        self.boxes = np.hstack([mins, maxs])  # (N, 4): xmin ymin xmax ymax
+        # Nodes in SoA layout: one contiguous array per field. Leaves
+        # own a contiguous run of self.order (the section indices,
+        # reshuffled during the build) given by first and count
+        nodes = []  # (xmin, ymin, xmax, ymax, left, right, first, count)
+        order = []
+        self._build(np.arange(len(segments)), (mins + maxs) / 2, leaf_size,
+                    nodes, order)
+        fields = np.asarray(nodes, dtype=np.float64).T
+        self.node_xmin = np.ascontiguousarray(fields[0], dtype=np.float32)
+        self.node_ymin = np.ascontiguousarray(fields[1], dtype=np.float32)
+        self.node_xmax = np.ascontiguousarray(fields[2], dtype=np.float32)
+        self.node_ymax = np.ascontiguousarray(fields[3], dtype=np.float32)
+        self.left  = np.ascontiguousarray(fields[4], dtype=np.int32)
+        self.right = np.ascontiguousarray(fields[5], dtype=np.int32)
+        self.first = np.ascontiguousarray(fields[6], dtype=np.int32)
+        self.count = np.ascontiguousarray(fields[7], dtype=np.int32)
+        self.order = np.asarray(order, dtype=np.intp)
+
+    def _build(self, indices, centers, leaf_size, nodes, order):
+        xmin = self.boxes[indices, 0].min()
+        ymin = self.boxes[indices, 1].min()
+        xmax = self.boxes[indices, 2].max()
+        ymax = self.boxes[indices, 3].max()
+        node_id = len(nodes)
+        nodes.append(None)  # reserve the slot, children come after
+        if len(indices) <= leaf_size:
+            nodes[node_id] = (xmin, ymin, xmax, ymax, -1, -1,
+                              len(order), len(indices))
+            order.extend(indices)
+            return node_id
+        axis = 0 if (xmax - xmin) >= (ymax - ymin) else 1
+        split = np.argsort(centers[indices, axis])
+        half  = len(indices) // 2
+        left  = self._build(indices[split[:half]], centers, leaf_size, nodes, order)
+        right = self._build(indices[split[half:]], centers, leaf_size, nodes, order)
+        nodes[node_id] = (xmin, ymin, xmax, ymax, left, right, -1, 0)
+        return node_id
+
+    def query_ray(self, origin, direction):
+        #pylint:disable=invalid-name # (single letter x, y)
+        ox, oy = origin
+        dx, dy = direction
+        candidates = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if not self._ray_hits_box(ox, oy, dx, dy,
+                                      self.node_xmin[node], self.node_ymin[node],
+                                      self.node_xmax[node], self.node_ymax[node]):
+                continue
+            if self.left[node] < 0:
+                first = self.first[node]
+                candidates.append(self.order[first:first + self.count[node]])
+            else:
+                stack.append(self.left[node])
+                stack.append(self.right[node])
+        if candidates:
+            return np.concatenate(candidates)
+        return np.empty(0, dtype=np.intp)
+
+    @staticmethod
+    def _ray_hits_box(ox, oy, dx, dy, xmin, ymin, xmax, ymax):
+        """Slab test: does the (forward) ray reach the box at all?"""
+        #pylint:disable=invalid-name # (single letter o, d, t)
+        t_near = 0.0
+        t_far  = math.inf
+        for o, d, low, high in ((ox, dx, xmin, xmax), (oy, dy, ymin, ymax)):
+            if d == 0:
+                if not low <= o <= high:
+                    return False
+                continue
+            t_1 = (low - o) / d
+            t_2 = (high - o) / d
+            if t_1 > t_2:
+                t_1, t_2 = t_2, t_1
+            t_near = max(t_near, t_1)
+            t_far  = min(t_far, t_2)
+        return t_near <= t_far
+
+
 class Map():
     def __init__(self, shapes):
+        self.set_shapes(shapes)
+
+    def set_shapes(self, shapes):
+        """
+        Rebuilds every per-map precomputation. This is the only place
+        that may recompute them: the shapes are static, so nothing here
+        belongs in the per-frame path.
+        """
         self.polygons = shapes
         self.lines = self._get_lines(self.polygons)
+        # Contiguous (N, 2, 2) array of the sections, for the vectorized
+        # ray intersections. float32 is plenty for pixel-scale geometry
+        # and halves the memory traffic of the intersection math
+        self.segments = np.asarray(self.lines, dtype=np.float32)
+        # Structure-of-arrays columns of the sections: one contiguous
+        # array per field, so the intersection loop streams each term
+        # instead of striding through interleaved rows. dx/dy hold the
+        # p1 - p2 endpoint differences, precomputed once per map
+        self.p1x = np.ascontiguousarray(self.segments[:, 0, 0])
+        self.p1y = np.ascontiguousarray(self.segments[:, 0, 1])
+        self.dx  = np.ascontiguousarray(self.segments[:, 0, 0] - self.segments[:, 1, 0])
+        self.dy  = np.ascontiguousarray(self.segments[:, 0, 1] - self.segments[:, 1, 1])
+        self.bvh = BVH2D(self.segments)
         self.ray_targets = self._get_ray_targets(self.lines)
+        # Deduplicated (P, 2) array of the targets, ready for cast_rays
+        self.target_points = np.asarray(list(set(self.ray_targets)), dtype=np.float32)
 
         self.background = self._get_background()
         self.lights = self._get_fixed_lights()
@@ -221,37 +385,53 @@ class Map():
 
     def _get_ray_targets(self, lines):
         points = [point for line in lines for point in line]
-        points += self._get_lines_intersections(lines)
+        points += self._get_lines_intersections(self.segments)
         return points
 
-    def _get_lines_intersections(self, lines):
+    def _get_lines_intersections(self, segments):
+        """
+        Computes where the sections cross each other, testing all pairs
+        at once with NumPy instead of a quadratic Python double loop.
+        """
         #pylint:disable=invalid-name # (single letter x, y, t, u)
-        intersections = []
-        for i, line1 in enumerate(lines):
-            for line2 in lines[i:]:
-                try:
-                    x, y, t, u = compute_line_line_intersection(line1, line2)
-                    if 0 < t < 1 and 0 < u < 1:
-                        intersections.append((x, y))
-                except ZeroDivisionError:
-                    pass
-        return set(intersections)
+        i, j = np.triu_indices(len(segments), k=1)
+        x_1 = segments[i, 0, 0]
+        y_1 = segments[i, 0, 1]
+        x_2 = segments[i, 1, 0]
+        y_2 = segments[i, 1, 1]
+        x_3 = segments[j, 0, 0]
+        y_3 = segments[j, 0, 1]
+        x_4 = segments[j, 1, 0]
+        y_4 = segments[j, 1, 1]
+
+        denominator = (x_1 - x_2)*(y_3 - y_4) - (y_1 - y_2)*(x_3 - x_4)
+        valid = denominator != 0  # parallel lines never intersect
+        denominator = np.where(valid, denominator, 1.0)
+
+        t = ((x_1 - x_3) * (y_3 - y_4) - (y_1 - y_3) * (x_3 - x_4)) / denominator
+        u = ((x_1 - x_3) * (y_1 - y_2) - (y_1 - y_3) * (x_1 - x_2)) / denominator
+        # keep intersections inside both sections
+        valid &= (0 < t) & (t < 1) & (0 < u) & (u < 1)
+
+        xs = x_1 + t * (x_2 - x_1)
+        ys = y_1 + t * (y_2 - y_1)
+        return set(zip(xs[valid], ys[valid]))
 
     def _get_fixed_lights(self):
         size_big = 800
         size_small = 300
         alpha = 64
         lights = [
-            ShadowCaster((400, 300), size_big,   pg.Color("white"), alpha),
-            ShadowCaster((740,  60), size_small, pg.Color("orange"), alpha),
-            ShadowCaster((740, 210), size_small, pg.Color("orange"), alpha),
-            ShadowCaster((740, 320), size_small, pg.Color("orange"), alpha),
-            ShadowCaster((740, 430), size_small, pg.Color("orange"), alpha),
+            ShadowCaster((400, 300), size_big,   WHITE, alpha),
+            ShadowCaster((740,  60), size_small, ORANGE, alpha),
+            ShadowCaster((740, 210), size_small, ORANGE, alpha),
+            ShadowCaster((740, 320), size_small, ORANGE, alpha),
+            ShadowCaster((740, 430), size_small, ORANGE, alpha),
         ]
 
         surf = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert_alpha()
         for light in lights:
-            light.update_triangles(self.lines, self.ray_targets)
+            light.update_triangles(self)
             light.draw(surf)
 
         return surf
@@ -262,22 +442,28 @@ class Map():
 
     def draw_lines(self, surface):
         for line in self.polygons:
-            pg.draw.lines(surface, pg.Color("black"), False, line, 5)
+            pg.draw.lines(surface, BLACK, False, line, 5)
 
 
 class Game():
     def __init__(self):
         self.map = Map(SHAPES)
-        self.cursor = ShadowCaster((0, 0), 600, pg.Color("gold"), 64)
+        self.cursor = ShadowCaster((0, 0), 600, GOLD, 64)
+        self._last_pos = None
 
     def update(self):
         # Make sure cursor is inside the screen so all rays can find at least one intersection
         cursor_x, cursor_y = pg.mouse.get_pos()
         if not 0 < cursor_x < SCREEN_WIDTH or not 0 < cursor_y < SCREEN_HEIGHT:
             return
+        # The map is static, so an unmoved cursor means the fan from the
+        # previous frame is still valid: skip the whole recomputation
+        if (cursor_x, cursor_y) == self._last_pos:
+            return
+        self._last_pos = (cursor_x, cursor_y)
 
-        self.cursor.set_position(pg.mouse.get_pos())
-        self.cursor.update_triangles(self.map.lines, self.map.ray_targets)
+        self.cursor.set_position((cursor_x, cursor_y))
+        self.cursor.update_triangles(self.map)
 
     def draw(self, surface):
         self.map.draw_surface(surface)
@@ -285,7 +471,7 @@ class Game():
         self.cursor.draw(surface)
 
         self.map.draw_lines(surface)
-        pg.draw.circle(surface, pg.Color("red"), pg.mouse.get_pos(), 8)
+        pg.draw.circle(surface, RED, pg.mouse.get_pos(), 8)
 
 
 class App():
@@ -300,6 +486,19 @@ class App():
         self.timer  = pg.USEREVENT
         pg.time.set_timer(self.timer, TIMER_MS)
 
+        if closest_hits is not None:
+            # Trigger the JIT compile before the first frame, with the
+            # layouts the frames will use: a one-leaf BVH over one section
+            column = np.zeros(1, dtype=np.float32)
+            link   = np.full(1, -1, dtype=np.int32)
+            closest_hits(0.0, 0.0, np.zeros((1, 2), dtype=np.float32),
+                         column, column, column, column,
+                         column, column, column, column,
+                         link, link, np.zeros(1, dtype=np.int32),
+                         np.ones(1, dtype=np.int32), np.zeros(1, dtype=np.intp),
+                         np.empty((1, 2), dtype=np.float32),
+                         np.empty(1, dtype=np.int64))
+
         self.game = Game()
         self.main_loop()
 
@@ -327,7 +526,7 @@ class App():
 
     def print_fps(self):
         text = f"FPS: {int(self.clock.get_fps())}"
-        rendered_text = self.font.render(text, True, pg.Color("red"))
+        rendered_text = self.font.render(text, True, RED)
         self.screen.blit(rendered_text, (10, 10))
 
 